@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+CameraEnumerator for probing available cameras off the GUI thread.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import cv2
+from PyQt6.QtCore import QThread, pyqtSignal
+
+# V4L2 only exists on Linux; elsewhere let OpenCV pick the native backend
+CAMERA_BACKEND = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+
+
+class CameraEnumerator(QThread):
+    """Thread for probing camera indices without blocking the UI."""
+
+    cameras_found = pyqtSignal(list)  # sorted list of working camera indices
+
+    def __init__(self, max_index=10):
+        super().__init__()
+        self.max_index = max_index
+
+    def _probe(self, index):
+        """Return the camera index if the device opens and streams, else None."""
+        # V4L2 indices map to device nodes, so missing ones cost a stat, not an open
+        if CAMERA_BACKEND == cv2.CAP_V4L2 and not os.path.exists(f"/dev/video{index}"):
+            return None
+        cap = cv2.VideoCapture(index, CAMERA_BACKEND)
+        try:
+            if cap.isOpened():
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                # grab() proves the device streams without decoding a frame
+                if cap.grab():
+                    return index
+            return None
+        finally:
+            cap.release()
+
+    def run(self):
+        """Probe all camera indices and emit the ones that work."""
+        # Each index hits a distinct device and OpenCV releases the GIL while
+        # opening it, so probing concurrently costs max-of-opens, not the sum.
+        with ThreadPoolExecutor(max_workers=self.max_index) as executor:
+            futures = [executor.submit(self._probe, i) for i in range(self.max_index)]
+            found = [f.result() for f in as_completed(futures)]
+        self.cameras_found.emit(sorted(i for i in found if i is not None))
@@ -51,6 +51,11 @@ class CameraInterface(QGroupBox):
             self.camera_selection_changed.emit
         )
 
+        # Placeholder until the background enumeration reports back
+        self.camera_combo.addItem("Detecting cameras...")
+        self.camera_combo.setEnabled(False)
+        self.start_stop_btn.setEnabled(False)
+
         controls_layout.addWidget(self.camera_combo)
 
         controls_layout.addStretch()
@@ -68,6 +73,8 @@ class CameraInterface(QGroupBox):
 
         self.camera_combo.addItems(cameras)
 
+        self.camera_combo.setEnabled(True)
+
         if cameras and "No cameras found" in cameras[0]:
             self.start_stop_btn.setEnabled(False)
 
@@ -6,38 +6,42 @@ in the QR Code Scanner application.
 
 import json
 
-import cv2
-from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from PyQt6.QtCore import QObject, pyqtSignal
+from PyQt6.QtGui import QImage
 
+from .camera_enumerator import CameraEnumerator
 from .screen_capture_thread import ScreenCaptureThread
 from .video_file_thread import VideoFileThread
 from .video_thread import VideoThread
 
+# Longest side of screen capture frames sent to the preview widget
+PREVIEW_MAX_DIM = 1280
+
 
 class CameraManager(QObject):
     """Manages camera operations, including enumeration and video thread."""
 
-    frame_ready = pyqtSignal(object, list)
+    frame_ready = pyqtSignal(QImage, list)  # BGR888 frame, qr_codes
     cameras_enumerated = pyqtSignal(list)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.video_thread = None
+        self.enumerator_thread = None
         self.current_camera_index = 0
         self.available_cameras = []
 
     def enumerate_cameras(self):
-        """Enumerate available cameras and emit the list."""
-        self.available_cameras = []
-        for i in range(10):
-            cap = cv2.VideoCapture(i, cv2.CAP_V4L2)
-            if not cap.isOpened():
-                cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                ret, frame = cap.read()
-                if ret and frame is not None:
-                    self.available_cameras.append(f"Camera {i}")
-                cap.release()
+        """Start enumerating cameras in the background; emits the list when done."""
+        if self.enumerator_thread and self.enumerator_thread.isRunning():
+            return
+        self.enumerator_thread = CameraEnumerator()
+        self.enumerator_thread.cameras_found.connect(self.on_cameras_found)
+        self.enumerator_thread.start()
+
+    def on_cameras_found(self, indices):
+        """Slot to store the probed cameras and emit the list."""
+        self.available_cameras = [f"Camera {i}" for i in indices]
 
         if not self.available_cameras:
             self.available_cameras = ["No cameras found"]
@@ -84,10 +88,18 @@ class CameraManager(QObject):
             return False
 
         self.video_thread = VideoThread(self.current_camera_index)
-        self.video_thread.frame_ready.connect(self.frame_ready.emit)
+        self.video_thread.frame_available.connect(self.on_frame_available)
         self.video_thread.start()
         return True
 
+    def on_frame_available(self):
+        """Slot to fetch the newest frame from the video thread and emit it."""
+        if not self.video_thread:
+            return
+        item = self.video_thread.take_frame()
+        if item:
+            self.frame_ready.emit(*item)
+
     def stop_camera(self):
         """Stop the camera and video processing."""
         if self.video_thread:
@@ -117,7 +129,9 @@ class ScreenCaptureManager(QObject):
 
     def start_screen_capture(self):
         """Start the screen capture and processing."""
-        self.screen_capture_thread = ScreenCaptureThread()
+        # The preview widget never shows more than this, so let the service
+        # downscale once instead of scaling the full frame on every paint
+        self.screen_capture_thread = ScreenCaptureThread(max_dim=PREVIEW_MAX_DIM)
         self.screen_capture_thread.frame_ready.connect(self.frame_ready.emit)
         self.screen_capture_thread.error_occurred.connect(self.error_occurred.emit)
         self.screen_capture_thread.start()
@@ -194,13 +208,10 @@ class ConnectionManager(QObject):
     def __init__(self, coordinator, parent=None):
         super().__init__(parent)
         self.coordinator = coordinator
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.check_status)
-        self.timer.start(100)  # Check every 100ms
-
-    def check_status(self):
-        """Check for status updates from the coordinator and emit signals."""
-        status = self.coordinator.get_status()
-        if status:
-            status_type, message = status
-            self.status_update.emit(f"[{status_type.upper()}] {message}")
+        # The coordinator pushes updates from its asyncio thread; emitting the
+        # signal there is queued onto the GUI thread by Qt.
+        self.coordinator.set_status_callback(self.on_status)
+
+    def on_status(self, status_type, message):
+        """Format a status update from the coordinator and emit it."""
+        self.status_update.emit(f"[{status_type.upper()}] {message}")
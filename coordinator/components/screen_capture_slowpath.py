@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Slow screen capture methods that take a screenshot per frame by spawning a
+tool or going through PIL. They are kept out of the main capture service and
+only imported when explicitly selected via the PHOSAIC_CAPTURE_METHOD
+environment variable; mss (X11) and persistent FFmpeg (Wayland) are the
+supported defaults.
+"""
+
+import logging
+import os
+import re
+import subprocess
+import tempfile
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Binary PPM header as written by grim: magic, width, height, maxval
+PPM_HEADER = re.compile(rb"P6\s+(\d+)\s+(\d+)\s+(\d+)\s")
+
+# Try to import pyscreenshot for Wayland support
+try:
+    import pyscreenshot as ImageGrab
+
+    PYSCREENSHOT_AVAILABLE = True
+except ImportError:
+    PYSCREENSHOT_AVAILABLE = False
+    logger.warning("pyscreenshot not available, Wayland capture may not work")
+
+
+def capture_with_pyscreenshot(scratch):
+    """
+    Capture screen using pyscreenshot (Wayland).
+
+    Args:
+        scratch: Callable (stage, shape) -> reusable output buffer
+    """
+    if not PYSCREENSHOT_AVAILABLE:
+        return None
+    try:
+        # pyscreenshot automatically uses the right backend for Wayland
+        img = ImageGrab.grab()
+        # Convert PIL Image to numpy array (PIL returns RGB)
+        frame = np.array(img)
+
+        # Ensure frame is valid
+        if frame.size == 0:
+            return None
+
+        # Convert RGB to BGR for OpenCV/video streaming compatibility
+        # pyscreenshot returns RGB, but we need BGR for video track
+        if len(frame.shape) == 3 and frame.shape[2] == 3:
+            frame = cv2.cvtColor(
+                frame, cv2.COLOR_RGB2BGR, dst=scratch("bgr", frame.shape)
+            )
+        elif len(frame.shape) == 3 and frame.shape[2] == 4:
+            # Drop alpha and swap R/B in a single pass
+            frame = cv2.cvtColor(
+                frame,
+                cv2.COLOR_RGBA2BGR,
+                dst=scratch("bgr", frame.shape[:2] + (3,)),
+            )
+
+        if not frame.flags["C_CONTIGUOUS"]:
+            frame = np.ascontiguousarray(frame)
+        return frame
+    except Exception as e:
+        logger.debug(f"pyscreenshot capture error: {e}")
+        return None
+
+
+# Long-lived shell that runs grim each time a line arrives on its stdin, so a
+# frame costs one fork/exec of grim instead of a full subprocess.run setup
+GRIM_HELPER = "while read _; do grim -t ppm - || exit 1; done"
+_grim_process = None
+
+
+def _start_grim_helper():
+    """Launch the grim helper shell."""
+    global _grim_process
+    _grim_process = subprocess.Popen(
+        ["sh", "-c", GRIM_HELPER],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def _stop_grim_helper():
+    """Terminate the grim helper shell if it is running."""
+    global _grim_process
+    process = _grim_process
+    _grim_process = None
+    if process:
+        try:
+            process.stdin.close()
+            process.terminate()
+            process.wait(timeout=2)
+        except Exception:
+            try:
+                process.kill()
+            except Exception:
+                pass
+
+
+def _read_ppm_header(pipe):
+    """Read a binary PPM header from pipe and return its regex match, or None."""
+    header = b""
+    # The header is a few dozen bytes at most; read it byte by byte so none
+    # of the pixel data is consumed
+    while len(header) < 64:
+        byte = pipe.read(1)
+        if not byte:
+            return None
+        header += byte
+        match = PPM_HEADER.fullmatch(header)
+        if match:
+            return match
+    return None
+
+
+def capture_with_grim(scratch):
+    """
+    Capture screen using grim (wlroots/Wayland) as raw PPM on stdout.
+
+    Args:
+        scratch: Callable (stage, shape) -> reusable output buffer
+    """
+    try:
+        if _grim_process is None or _grim_process.poll() is not None:
+            _stop_grim_helper()
+            _start_grim_helper()
+
+        _grim_process.stdin.write(b"\n")
+        _grim_process.stdin.flush()
+
+        # Header is "P6 <width> <height> <maxval>" followed by one whitespace byte;
+        # PPM is uncompressed, so the pixels can be used without a PNG decode
+        header = _read_ppm_header(_grim_process.stdout)
+        if header is None or header.group(3) != b"255":
+            logger.debug("grim returned an unsupported PPM header")
+            _stop_grim_helper()
+            return None
+        width, height = int(header.group(1)), int(header.group(2))
+
+        rgb = scratch("ppm", (height, width, 3))
+        view = memoryview(rgb).cast("B")
+        offset = 0
+        while offset < len(view):
+            n = _grim_process.stdout.readinto(view[offset:])
+            if not n:
+                logger.debug("grim helper exited mid-frame")
+                _stop_grim_helper()
+                return None
+            offset += n
+
+        return cv2.cvtColor(
+            rgb, cv2.COLOR_RGB2BGR, dst=scratch("bgr", (height, width, 3))
+        )
+    except Exception as e:
+        logger.debug(f"grim capture error: {e}")
+        _stop_grim_helper()
+        return None
+
+
+# Cleared once gnome-screenshot has failed to write to /dev/stdout, so later
+# frames go straight to the temp-file path instead of spawning it twice
+_gnome_screenshot_to_stdout = True
+
+
+def capture_with_gnome_screenshot(scratch):
+    """
+    Capture screen using gnome-screenshot (GNOME Wayland).
+
+    Args:
+        scratch: Callable (stage, shape) -> reusable output buffer
+    """
+    global _gnome_screenshot_to_stdout
+    try:
+        if not _gnome_screenshot_to_stdout:
+            return _capture_gnome_screenshot_to_file()
+
+        # Have gnome-screenshot write the PNG to our pipe instead of a file
+        result = subprocess.run(
+            ["gnome-screenshot", "-f", "/dev/stdout"], capture_output=True, timeout=3
+        )
+        if result.returncode == 0 and result.stdout:
+            frame = cv2.imdecode(
+                np.frombuffer(result.stdout, dtype=np.uint8), cv2.IMREAD_COLOR
+            )
+        else:
+            # Some versions refuse to write to a non-regular file, either
+            # failing outright or exiting cleanly without output
+            frame = _capture_gnome_screenshot_to_file()
+            if frame is not None:
+                _gnome_screenshot_to_stdout = False
+
+        if frame is None:
+            return None
+
+        if not frame.flags["C_CONTIGUOUS"]:
+            frame = np.ascontiguousarray(frame)
+        return frame
+    except Exception as e:
+        logger.debug(f"gnome-screenshot capture error: {e}")
+        return None
+
+
+def _capture_gnome_screenshot_to_file():
+    """Capture with gnome-screenshot through a temporary PNG file."""
+    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
+        tmp_path = tmp_file.name
+    try:
+        result = subprocess.run(
+            ["gnome-screenshot", "-f", tmp_path], capture_output=True, timeout=3
+        )
+        if result.returncode != 0:
+            return None
+        return cv2.imread(tmp_path)
+    finally:
+        os.unlink(tmp_path)
+
+
+def close():
+    """Release helper processes kept alive between frames."""
+    _stop_grim_helper()
+
+
+# Capture method name -> capture function
+CAPTURE_FUNCTIONS = {
+    "pyscreenshot": capture_with_pyscreenshot,
+    "grim": capture_with_grim,
+    "gnome-screenshot": capture_with_gnome_screenshot,
+}
@@ -3,8 +3,6 @@
 ScreenCaptureThread for consuming screen frames from the centralized service.
 """
 
-import time
-
 from PyQt6.QtCore import QThread, pyqtSignal, QWaitCondition, QMutex
 
 from .screen_capture_service import ScreenCaptureService
@@ -13,22 +11,29 @@ from .screen_capture_service import ScreenCaptureService
 class ScreenCaptureThread(QThread):
     """
     Thread for consuming screen frames from the centralized ScreenCaptureService.
-    This thread reads frames from the service buffer and emits them via PyQt signals.
+    The service pushes each new frame to this thread's subscription, which emits
+    it via PyQt signals; the thread itself only keeps the subscription alive.
     """
 
     frame_ready = pyqtSignal(object)  # frame
     error_occurred = pyqtSignal(str)  # error message
 
-    def __init__(self, fps=30):
+    def __init__(self, fps=30, max_dim=None):
+        """
+        Args:
+            fps: Capture rate to start the service with if it is not running
+            max_dim: Optional cap on the longer side of emitted frames
+        """
         super().__init__()
         self.fps = fps
+        self.max_dim = max_dim
         self.running = False
         self.service = ScreenCaptureService()
         self.mutex = QMutex()
         self.condition = QWaitCondition()
 
     def run(self):
-        """Main thread loop for consuming frames from the service."""
+        """Subscribe to the service and wait until stopped."""
         self.running = True
 
         # Start the centralized service if not already running
@@ -45,41 +50,24 @@ class ScreenCaptureThread(QThread):
                 max_resolution=max_resolution
             )
 
-        frame_time = 1.0 / self.fps
-        sleep_ms = int(frame_time * 1000)
+        # Frames are emitted from the capture thread as they are published;
+        # the queued signal delivers them to the GUI thread. Keep one bound
+        # emit so the same object is unsubscribed.
+        emit_frame = self.frame_ready.emit
+        self.service.subscribe(emit_frame, max_dim=self.max_dim)
 
+        self.mutex.lock()
         while self.running:
-            try:
-                # Get the latest frame from the centralized service
-                frame = self.service.get_latest_frame()
-
-                if frame is not None and frame.size > 0:
-                    # Emit the frame
-                    self.frame_ready.emit(frame)
-
-                # Wait to maintain the desired FPS (interruptible)
-                # Break sleep into smaller chunks to check running flag more frequently
-                elapsed = 0
-                chunk_ms = 10  # Check every 10ms
-                while elapsed < sleep_ms and self.running:
-                    self.mutex.lock()
-                    remaining = min(chunk_ms, sleep_ms - elapsed)
-                    self.condition.wait(self.mutex, remaining)
-                    self.mutex.unlock()
-                    elapsed += chunk_ms
+            self.condition.wait(self.mutex)
+        self.mutex.unlock()
 
-            except Exception as e:
-                error_str = str(e)
-                print(f"Error consuming screen frame: {error_str}")
-                self.error_occurred.emit(f"Error consuming screen frame: {error_str}")
-                # Wait a bit before retrying
-                time.sleep(0.1)
+        self.service.unsubscribe(emit_frame)
 
     def stop(self):
         """Stop the screen capture thread."""
+        self.mutex.lock()
         self.running = False
         # Wake up the thread if it's waiting
-        self.mutex.lock()
         self.condition.wakeAll()
         self.mutex.unlock()
         self.wait()
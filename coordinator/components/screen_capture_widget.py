@@ -3,7 +3,6 @@
 ScreenCaptureWidget component for displaying screen capture feed.
 """
 
-import cv2
 import numpy as np
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QImage, QPainter, QPixmap
@@ -19,6 +18,9 @@ class ScreenCaptureWidget(QWidget):
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.current_frame = None
         self.pixmap = None
+        # Last scaled pixmap and the (widget size, pixmap id) it was made for
+        self._scaled_cache = None
+        self._scaled_key = None
 
     def set_frame(self, frame):
         """Set the frame to display."""
@@ -34,21 +36,21 @@ class ScreenCaptureWidget(QWidget):
             if height == 0 or width == 0:
                 return
 
-            self.current_frame = frame
-
-            # Convert BGR to RGB
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
             # Ensure frame is contiguous in memory for QImage
-            rgb_frame = np.ascontiguousarray(rgb_frame)
+            if not frame.flags["C_CONTIGUOUS"]:
+                frame = np.ascontiguousarray(frame)
 
-            # Create QImage from frame (make a copy to ensure data remains valid)
-            height, width, channel = rgb_frame.shape
-            bytes_per_line = 3 * width
-            # Create a copy of the data to ensure QImage has its own copy
-            rgb_data = rgb_frame.copy()
+            # Keep the array the QImage points at referenced on the widget;
+            # QImage does not hold a reference to the numpy buffer
+            self.current_frame = frame
+
+            # Wrap the BGR frame as-is; Qt reads BGR888 natively, so no channel
+            # swap is needed. The published frame is read-only, so the image is
+            # only read from: it lives just for this call, and
+            # QPixmap.fromImage below takes a deep copy of the pixels before
+            # the next frame can replace current_frame.
             q_image = QImage(
-                rgb_data.data, width, height, bytes_per_line, QImage.Format.Format_RGB888
+                frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888
             )
 
             # Ensure the image is valid
@@ -57,6 +59,7 @@ class ScreenCaptureWidget(QWidget):
 
             # Create pixmap and scale it to fit widget while maintaining aspect ratio
             self.pixmap = QPixmap.fromImage(q_image)
+            self._scaled_key = None
             if self.pixmap.isNull():
                 return
 
@@ -76,10 +79,22 @@ class ScreenCaptureWidget(QWidget):
         # Get widget dimensions
         widget_rect = self.rect()
 
-        # Scale pixmap to fit widget while maintaining aspect ratio
-        scaled_pixmap = self.pixmap.scaled(
-            widget_rect.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
-        )
+        # Scale pixmap to fit widget while maintaining aspect ratio; repaints
+        # without a new frame or a resize reuse the last result
+        key = (widget_rect.size(), id(self.pixmap))
+        if key != self._scaled_key:
+            target_size = self.pixmap.size().scaled(
+                widget_rect.size(), Qt.AspectRatioMode.KeepAspectRatio
+            )
+            if target_size == self.pixmap.size():
+                # Shown at native size; no filtering pass needed
+                self._scaled_cache = self.pixmap
+            else:
+                self._scaled_cache = self.pixmap.scaled(
+                    target_size, Qt.AspectRatioMode.IgnoreAspectRatio, Qt.TransformationMode.SmoothTransformation
+                )
+            self._scaled_key = key
+        scaled_pixmap = self._scaled_cache
 
         # Calculate position to center the image
         x = (widget_rect.width() - scaled_pixmap.width()) // 2
@@ -92,4 +107,6 @@ class ScreenCaptureWidget(QWidget):
         """Clear the current frame."""
         self.current_frame = None
         self.pixmap = None
+        self._scaled_cache = None
+        self._scaled_key = None
         self.update()
@@ -3,21 +3,43 @@
 VideoFileThread for reading frames from a video file for UI preview.
 """
 
+import logging
+import queue
+import threading
 import time
 
 import cv2
-from PyQt6.QtCore import QThread, pyqtSignal, QWaitCondition, QMutex
+from PyQt6.QtCore import QElapsedTimer, QThread, pyqtSignal, QWaitCondition, QMutex
+
+# Try to import PyAV with hardware decoding support (PyAV 14+)
+try:
+    import av
+    from av.codec.hwaccel import HWAccel, hwdevices_available
+
+    PYAV_HWACCEL_AVAILABLE = True
+except ImportError:
+    PYAV_HWACCEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# FFmpeg hardware device types to try, in order of preference
+HW_DEVICE_TYPES = ("cuda", "vaapi", "videotoolbox", "d3d11va", "qsv")
 
 
 class VideoFileThread(QThread):
     """
     Thread for reading frames from a video file and emitting them via PyQt signals.
-    Used for UI preview of video file playback.
+    Used for UI preview of video file playback. Frames are decoded on a helper
+    thread into a small queue, so decoding the next frame overlaps with pacing
+    and displaying the current one.
     """
 
     frame_ready = pyqtSignal(object)  # frame
     error_occurred = pyqtSignal(str)  # error message
 
+    # Decoded frames buffered ahead of playback
+    DECODE_AHEAD = 2
+
     def __init__(self, video_file_path, fps=None, loop_video=True):
         super().__init__()
         self.video_file_path = video_file_path
@@ -29,81 +51,191 @@ class VideoFileThread(QThread):
         self.condition = QWaitCondition()
         self.frame_width = None
         self.frame_height = None
+        self._frames = queue.Queue(maxsize=self.DECODE_AHEAD)
+        self._container = None  # PyAV container when hardware decoding is used
+
+    def _put_frame(self, frame):
+        """
+        Queue a decoded frame (None marks the end of the video), blocking while
+        the queue is full. Playback drains it at the target FPS, so decode runs
+        at most DECODE_AHEAD frames ahead.
+
+        Returns:
+            bool: False if the thread was stopped while waiting
+        """
+        while self.running:
+            try:
+                self._frames.put(frame, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _open_hw_container(self):
+        """
+        Open the video with PyAV and the first hardware decoder from
+        HW_DEVICE_TYPES that this FFmpeg build and machine support.
+
+        Returns:
+            av container, or None if hardware decoding is not available
+        """
+        if not PYAV_HWACCEL_AVAILABLE:
+            return None
+        available = hwdevices_available()
+        device_type = next((t for t in HW_DEVICE_TYPES if t in available), None)
+        if device_type is None:
+            logger.info("No hardware video decoder available, using OpenCV")
+            return None
+        try:
+            container = av.open(
+                self.video_file_path,
+                hwaccel=HWAccel(device_type=device_type, allow_software_fallback=True),
+            )
+            container.streams.video[0].thread_type = "AUTO"
+            logger.info(f"Decoding video with {device_type} hardware acceleration")
+            return container
+        except Exception as e:
+            logger.warning(
+                f"{device_type} video decoding unavailable, using OpenCV: {e}"
+            )
+            return None
+
+    def _decode_loop_av(self):
+        """Decode frames with PyAV into the queue until stopped or the video ends."""
+        stream = self._container.streams.video[0]
+        while self.running:
+            try:
+                for av_frame in self._container.decode(stream):
+                    if not self._put_frame(av_frame.to_ndarray(format="bgr24")):
+                        return
+                # End of video
+                if not self.loop_video:
+                    self._put_frame(None)
+                    return
+                self._container.seek(0)
+            except Exception as e:
+                error_str = str(e)
+                print(f"Error reading video frame: {error_str}")
+                self.error_occurred.emit(f"Error reading video frame: {error_str}")
+                time.sleep(0.1)
+
+    def _decode_loop(self):
+        """Decode frames into the queue until stopped or the video ends."""
+        while self.running:
+            try:
+                ret, frame = self.cap.read()
+
+                if not ret:
+                    # End of video
+                    if self.loop_video:
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        continue
+                    frame = None  # Tells the playback loop the video ended
+
+                elif frame is None or frame.size == 0:
+                    continue
+
+                if not self._put_frame(frame) or frame is None:
+                    return
+
+            except Exception as e:
+                error_str = str(e)
+                print(f"Error reading video frame: {error_str}")
+                self.error_occurred.emit(f"Error reading video frame: {error_str}")
+                time.sleep(0.1)
 
     def run(self):
-        """Main thread loop for reading frames from video file."""
+        """Main thread loop for playing frames from the video file."""
         self.running = True
+        decoder = None
 
         try:
-            # Open video file
-            self.cap = cv2.VideoCapture(self.video_file_path)
-            if not self.cap.isOpened():
-                error_msg = f"Failed to open video file: {self.video_file_path}"
-                self.error_occurred.emit(error_msg)
-                return
-
-            # Get video properties
-            video_fps = self.cap.get(cv2.CAP_PROP_FPS)
-            self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            # Prefer hardware decoding through PyAV, then OpenCV's FFmpeg backend
+            self._container = self._open_hw_container()
+            if self._container:
+                stream = self._container.streams.video[0]
+                video_fps = float(stream.average_rate or 0)
+                self.frame_width = stream.codec_context.width
+                self.frame_height = stream.codec_context.height
+                decode_loop = self._decode_loop_av
+            else:
+                self.cap = cv2.VideoCapture(self.video_file_path, cv2.CAP_FFMPEG)
+                if not self.cap.isOpened():
+                    self.cap = cv2.VideoCapture(self.video_file_path)
+                if not self.cap.isOpened():
+                    error_msg = f"Failed to open video file: {self.video_file_path}"
+                    self.error_occurred.emit(error_msg)
+                    return
+
+                # Get video properties
+                video_fps = self.cap.get(cv2.CAP_PROP_FPS)
+                self.frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+                self.frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+                decode_loop = self._decode_loop
 
             # Use video FPS if not specified
             if self.fps is None:
                 self.fps = video_fps if video_fps > 0 else 30
 
-            frame_time = 1.0 / self.fps
-            sleep_ms = int(frame_time * 1000)
+            decoder = threading.Thread(target=decode_loop, daemon=True)
+            decoder.start()
+
+            frame_time_ms = 1000.0 / self.fps
+            clock = QElapsedTimer()
+            clock.start()
+            next_deadline = 0.0
 
             while self.running:
                 try:
-                    ret, frame = self.cap.read()
-
-                    if not ret:
-                        # End of video
-                        if self.loop_video:
-                            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                            continue
-                        else:
-                            self.error_occurred.emit("End of video reached")
-                            break
-
-                    if frame is not None and frame.size > 0:
-                        # Emit the frame
-                        self.frame_ready.emit(frame)
-
-                    # Wait to maintain the desired FPS (interruptible)
-                    elapsed = 0
-                    chunk_ms = 10  # Check every 10ms
-                    while elapsed < sleep_ms and self.running:
-                        self.mutex.lock()
-                        remaining = min(chunk_ms, sleep_ms - elapsed)
-                        self.condition.wait(self.mutex, remaining)
-                        self.mutex.unlock()
-                        elapsed += chunk_ms
-
-                except Exception as e:
-                    error_str = str(e)
-                    print(f"Error reading video frame: {error_str}")
-                    self.error_occurred.emit(f"Error reading video frame: {error_str}")
-                    time.sleep(0.1)
+                    frame = self._frames.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if frame is None:
+                    self.error_occurred.emit("End of video reached")
+                    break
+
+                # Emit the frame
+                self.frame_ready.emit(frame)
+
+                # Wait until the next absolute deadline on a monotonic clock so
+                # decode time is not added to the period. Re-check the clock
+                # after each wake so a spurious wakeup cannot shorten the
+                # frame; stop() ends the wait early
+                next_deadline += frame_time_ms
+                if clock.elapsed() >= next_deadline:
+                    # Fell behind; restart the schedule instead of bursting
+                    next_deadline = float(clock.elapsed())
+                    continue
+
+                self.mutex.lock()
+                while self.running:
+                    delay_ms = int(next_deadline - clock.elapsed())
+                    if delay_ms <= 0:
+                        break
+                    self.condition.wait(self.mutex, delay_ms)
+                self.mutex.unlock()
 
         except Exception as e:
             error_str = str(e)
             self.error_occurred.emit(f"Error opening video file: {error_str}")
         finally:
+            self.running = False
+            if decoder:
+                decoder.join()
             if self.cap:
                 self.cap.release()
                 self.cap = None
+            if self._container:
+                self._container.close()
+                self._container = None
 
     def stop(self):
         """Stop the video file thread."""
+        self.mutex.lock()
         self.running = False
         # Wake up the thread if it's waiting
-        self.mutex.lock()
         self.condition.wakeAll()
         self.mutex.unlock()
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        # run() stops the decoder and closes the video before returning
         self.wait()
-
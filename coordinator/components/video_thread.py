@@ -3,22 +3,46 @@
 VideoThread for capturing and processing video frames.
 """
 
-from PyQt6.QtCore import QThread, pyqtSignal
+import time
+from collections import deque
+
+import cv2
+from PyQt6.QtCore import QMutex, QThread, pyqtSignal
+from PyQt6.QtGui import QImage
 from vision import QRCodeScanner
 
 
 class VideoThread(QThread):
-    """Thread for capturing and processing video frames."""
+    """
+    Thread for capturing and processing video frames.
+    The camera is opened with a one-frame buffer, so frames that arrive while
+    QR detection is running are dropped by the driver rather than queued.
+    """
+
+    frame_available = pyqtSignal()  # latest BGR888 QImage can be fetched with take_frame()
 
-    frame_ready = pyqtSignal(object, list)  # frame, qr_codes
+    # Mean absolute per-pixel difference below which a frame counts as static
+    STATIC_THRESHOLD = 2.0
 
-    def __init__(self, camera_index=0):
+    def __init__(self, camera_index=0, target_fps=15, min_fps=5):
         super().__init__()
         self.camera_index = camera_index
+        self.target_fps = target_fps
+        self.min_fps = min_fps
         self.cap = None
         self.running = False
         self.qr_scanner = QRCodeScanner()
         self.qr_scanner.camera_index = camera_index
+        self.qr_scanner.detect_width = 640
+        # Single slot for the newest (QImage, qr_codes, buffer); unconsumed frames
+        # are overwritten so a slow GUI never builds up a backlog of queued frames
+        self._latest = deque(maxlen=1)
+        self._latest_mutex = QMutex()
+        # Frame buffers are recycled instead of allocated per frame: a buffer is
+        # free again once its frame was dropped from the slot or superseded by
+        # the next take_frame(). At most three exist (taken, pending, in capture).
+        self._free_buffers = []
+        self._taken_buffer = None
 
     def run(self):
         """Main thread loop for video capture."""
@@ -28,18 +52,97 @@ class VideoThread(QThread):
 
         self.running = True
 
+        cap = self.qr_scanner.cap
+        interval = 1.0 / self.target_fps
+        last_retrieve = 0.0
+        prev_thumb = None
+        qr_codes = []
+        last_scan = 0.0
+
         while self.running:
-            ret, frame = self.qr_scanner.cap.read()
-            if ret:
-                # Detect QR codes using scanner
-                qr_codes = self.qr_scanner.detect_qr_codes(frame)
-                self.frame_ready.emit(frame, qr_codes)
-            else:
+            # grab() keeps the stream live without decoding; only frames that
+            # will actually be displayed and scanned are retrieved
+            if not cap.grab():
                 break
+            now = time.monotonic()
+            if now - last_retrieve < interval:
+                continue
+
+            ret, frame = cap.retrieve(self._acquire_buffer())
+            if not ret:
+                break
+            last_retrieve = now
+
+            # One pass builds the small grayscale image that both the static
+            # check and QR detection use
+            gray = self.qr_scanner.detection_gray(frame)
+
+            # Back off towards min_fps while the scene is static
+            thumb = cv2.resize(gray, (32, 24), interpolation=cv2.INTER_AREA)
+            static = (
+                prev_thumb is not None
+                and cv2.norm(thumb, prev_thumb, cv2.NORM_L1) / thumb.size
+                < self.STATIC_THRESHOLD
+            )
+            if static:
+                interval = min(interval * 1.5, 1.0 / self.min_fps)
+            else:
+                interval = 1.0 / self.target_fps
+            prev_thumb = thumb
+
+            # Detect QR codes using scanner; a static scene reuses the last
+            # result, with a full rescan at least once per second
+            if not static or now - last_scan >= 1.0:
+                qr_codes = self.qr_scanner.detect_qr_codes(frame, gray)
+                last_scan = now
+
+            # Wrap the BGR buffer directly; the buffer is not reused until the
+            # consumer has moved on to a later frame, so no copy is needed
+            height, width = frame.shape[:2]
+            image = QImage(
+                frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888
+            )
+            self._publish(image, qr_codes, frame)
 
         if self.qr_scanner.cap:
             self.qr_scanner.cap.release()
 
+    def _acquire_buffer(self):
+        """Return a free frame buffer for retrieve(), or None to let it allocate one."""
+        self._latest_mutex.lock()
+        buf = self._free_buffers.pop() if self._free_buffers else None
+        self._latest_mutex.unlock()
+        return buf
+
+    def _publish(self, image, qr_codes, frame):
+        """Store the newest frame, notifying the consumer only if none is pending."""
+        self._latest_mutex.lock()
+        pending = bool(self._latest)
+        if pending:
+            # The unconsumed frame is dropped; its buffer can be reused
+            self._free_buffers.append(self._latest[0][2])
+        self._latest.append((image, qr_codes, frame))
+        self._latest_mutex.unlock()
+        if not pending:
+            self.frame_available.emit()
+
+    def take_frame(self):
+        """
+        Pop the newest (QImage, qr_codes) pair, or None if it was already taken.
+        Taking a frame releases the previously taken one, so the consumer must be
+        done with the old QImage once it takes the next.
+        """
+        self._latest_mutex.lock()
+        item = None
+        if self._latest:
+            image, qr_codes, frame = self._latest.popleft()
+            if self._taken_buffer is not None:
+                self._free_buffers.append(self._taken_buffer)
+            self._taken_buffer = frame
+            item = (image, qr_codes)
+        self._latest_mutex.unlock()
+        return item
+
     def stop(self):
         """Stop the video thread."""
         self.running = False
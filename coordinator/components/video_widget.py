@@ -3,14 +3,17 @@
 VideoWidget component for displaying camera feed with QR code annotations.
 """
 
-import json
+import re
 
-import cv2
 import numpy as np
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QImage, QPainter, QPen, QPixmap
+from PyQt6.QtCore import QPoint, QRect, Qt
+from PyQt6.QtGui import QColor, QFont, QPainter, QPen, QPolygon
 from PyQt6.QtWidgets import QSizePolicy, QWidget
 
+# "id" field of a QR JSON payload (string or integer), found without parsing
+# the whole payload on every repaint
+QR_ID_PATTERN = re.compile(r'"id"\s*:\s*(?:"([^"]{0,64})"|(-?\d+))')
+
 
 class VideoWidget(QWidget):
     """Custom widget for displaying video feed with responsive scaling and QR code annotations."""
@@ -20,118 +23,150 @@ class VideoWidget(QWidget):
         self.setMinimumSize(320, 240)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         self.current_frame = None
-        self.pixmap = None
         self.qr_codes = []
 
-    def set_frame(self, frame, qr_codes=None):
-        """Set the frame and QR codes to display."""
-        self.current_frame = frame
-        self.qr_codes = qr_codes or []
+        # Target rect and QR annotation geometry for the current frame, reused
+        # by repaints (expose, overlap) until the frame or widget size changes
+        self._layout_key = None
+        self._layout = None
 
-        # Convert BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-
-        # Create QImage from frame
-        height, width, channel = rgb_frame.shape
-        bytes_per_line = 3 * width
-        q_image = QImage(
-            rgb_frame.data, width, height, bytes_per_line, QImage.Format.Format_RGB888
+        # Annotation pens and font, built once rather than per QR per repaint
+        self._pen_outline = QPen(QColor(0, 255, 0), 2)
+        # A round-capped pen draws the corner points as dots
+        self._pen_corner = QPen(
+            QColor(0, 0, 255), 5, Qt.PenStyle.SolidLine, Qt.PenCapStyle.RoundCap
         )
+        self._pen_text = QPen(QColor(255, 255, 255))
+        self._font_qr = QFont(self.font())
+        self._font_qr.setPointSize(8)
 
-        # Create pixmap and scale it to fit widget while maintaining aspect ratio
-        self.pixmap = QPixmap.fromImage(q_image)
+    def set_frame(self, frame, qr_codes=None):
+        """Set the frame (a QImage built by the video thread) and QR codes to display."""
+        # Only keep the image; it is drawn straight from the frame buffer on the
+        # next paint, so frames replaced before a repaint cost nothing
+        self.current_frame = frame
+        self.qr_codes = qr_codes or []
+        self._layout_key = None
         self.update()
 
     def paintEvent(self, event):
         """Override paint event to draw the scaled video frame with QR code annotations."""
-        if not self.pixmap:
+        if self.current_frame is None:
             return
 
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
+        key = (self.width(), self.height())
+        if key != self._layout_key:
+            self._layout = self._build_layout()
+            self._layout_key = key
+        target_rect, annotations = self._layout
+
+        # Only filter when actually scaling; at native size the image is copied
+        if target_rect.size() != self.current_frame.size():
+            painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+
+        # Draw the frame scaled into place by the painter, without building an
+        # intermediate pixmap
+        painter.drawImage(target_rect, self.current_frame)
+
+        # Draw QR code annotations if any exist
+        if annotations:
+            self.draw_qr_annotations(painter, annotations)
+
+    def _build_layout(self):
+        """
+        Compute where the current frame is drawn and its QR annotation geometry.
+
+        Returns:
+            Tuple of (target_rect, annotations) for draw_qr_annotations
+        """
         # Get widget dimensions
         widget_rect = self.rect()
 
-        # Scale pixmap to fit widget while maintaining aspect ratio
-        scaled_pixmap = self.pixmap.scaled(
-            widget_rect.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+        # Fit the frame to the widget while maintaining aspect ratio
+        display_size = self.current_frame.size().scaled(
+            widget_rect.size(), Qt.AspectRatioMode.KeepAspectRatio
         )
 
         # Calculate position to center the image
-        x = (widget_rect.width() - scaled_pixmap.width()) // 2
-        y = (widget_rect.height() - scaled_pixmap.height()) // 2
+        x = (widget_rect.width() - display_size.width()) // 2
+        y = (widget_rect.height() - display_size.height()) // 2
+        target_rect = QRect(x, y, display_size.width(), display_size.height())
 
-        # Draw the scaled pixmap centered in the widget
-        painter.drawPixmap(x, y, scaled_pixmap)
+        annotations = (
+            self._build_qr_annotations(target_rect) if self.qr_codes else []
+        )
+        return target_rect, annotations
 
-        # Draw QR code annotations if any exist
-        if self.qr_codes and self.current_frame is not None:
-            self.draw_qr_annotations(
-                painter, x, y, scaled_pixmap.width(), scaled_pixmap.height()
-            )
-
-    def draw_qr_annotations(
-        self, painter, offset_x, offset_y, display_width, display_height
-    ):
-        """Draw QR code bounding boxes and information overlays."""
-        if not self.current_frame is not None:
-            return
+    def _build_qr_annotations(self, target_rect):
+        """
+        Map QR code corners into widget coordinates and prepare their labels.
+
+        Args:
+            target_rect: Rect the current frame is drawn into
 
-        frame_height, frame_width = self.current_frame.shape[:2]
+        Returns:
+            List of (polygon, text_x, text_y, text) tuples
+        """
+        frame_width = self.current_frame.width()
+        frame_height = self.current_frame.height()
 
-        # Calculate scaling factors
-        scale_x = display_width / frame_width
-        scale_y = display_height / frame_height
+        # Calculate scaling factors and offset of the displayed frame
+        scale = np.array(
+            [target_rect.width() / frame_width, target_rect.height() / frame_height],
+            dtype=np.float32,
+        )
+        offset = np.array([target_rect.x(), target_rect.y()], dtype=np.float32)
 
+        annotations = []
         for i, (data, points) in enumerate(self.qr_codes):
             if points is not None:
-                # Scale points to match displayed pixmap
-                scaled_points = []
-                for point in points:
-                    x = int(point[0] * scale_x) + offset_x
-                    y = int(point[1] * scale_y) + offset_y
-                    scaled_points.append((x, y))
-
-                # Draw quadrilateral outline
-                painter.setPen(QPen(QColor(0, 255, 0), 2))
-                for j in range(len(scaled_points)):
-                    start_point = scaled_points[j]
-                    end_point = scaled_points[(j + 1) % len(scaled_points)]
-                    painter.drawLine(
-                        start_point[0], start_point[1], end_point[0], end_point[1]
-                    )
-
-                # Draw corner points
-                painter.setPen(QPen(QColor(0, 0, 255), 5))
-                for point in scaled_points:
-                    painter.drawEllipse(point[0] - 2, point[1] - 2, 4, 4)
+                # Scale all points to match the displayed frame in one operation
+                pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+                scaled = pts * scale + offset
+                polygon = QPolygon([QPoint(int(x), int(y)) for x, y in scaled])
 
                 # Calculate center point for text
-                center_x = int(sum(p[0] for p in scaled_points) / len(scaled_points))
-                center_y = int(sum(p[1] for p in scaled_points) / len(scaled_points))
+                center_x, center_y = (int(v) for v in scaled.mean(axis=0))
 
-                # Draw QR code info
-                font = painter.font()
-                font.setPointSize(8)
-                painter.setFont(font)
-                painter.setPen(QPen(QColor(255, 255, 255)))
-
-                # Try to parse ID from JSON for display
+                # Show the ID from the JSON payload, or the raw data if it has none
                 display_text = data
-                try:
-                    qr_json = json.loads(data)
-                    if "id" in qr_json:
-                        display_text = f"ID: {qr_json['id']}"
-                except (json.JSONDecodeError, TypeError):
-                    pass  # Fall back to raw data if parsing fails
+                match = QR_ID_PATTERN.search(data) if isinstance(data, str) else None
+                if match:
+                    qr_id = match.group(1)
+                    display_text = f"ID: {match.group(2) if qr_id is None else qr_id}"
+
+                short_text = display_text[:15]
+                if len(display_text) > 15:
+                    short_text += "..."
+                text = f"QR{i + 1}: {short_text}"
+                annotations.append((polygon, center_x - 50, center_y - 10, text))
+
+        return annotations
+
+    def draw_qr_annotations(self, painter, annotations):
+        """Draw prepared QR code bounding boxes and information overlays."""
+        painter.setFont(self._font_qr)
+
+        for polygon, text_x, text_y, text in annotations:
+            # Draw quadrilateral outline
+            painter.setPen(self._pen_outline)
+            painter.drawPolygon(polygon)
+
+            # Draw corner points
+            painter.setPen(self._pen_corner)
+            painter.drawPoints(polygon)
 
-                text = f"QR{i + 1}: {display_text[:15]}{'...' if len(display_text) > 15 else ''}"
-                painter.drawText(center_x - 50, center_y - 10, text)
+            # Draw QR code info
+            painter.setPen(self._pen_text)
+            painter.drawText(text_x, text_y, text)
 
     def clear(self):
         """Clear the current frame."""
         self.current_frame = None
-        self.pixmap = None
         self.qr_codes = []
+        self._layout_key = None
+        self._layout = None
         self.update()
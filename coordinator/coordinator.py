@@ -2,9 +2,8 @@ import argparse
 import asyncio
 import json
 import logging
-import queue
 import threading
-import time
+from collections import deque
 from concurrent.futures import TimeoutError
 
 import av
@@ -18,72 +17,208 @@ from websockets.client import connect
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for signaling messages. Outgoing payloads are decoded back to
+# str so they still go out as text frames, which the signaling server expects.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+
+    def json_dumps(obj):
+        return orjson.dumps(obj).decode()
+
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+# Run the WebRTC/signaling loop on libuv when uvloop is installed (not Windows)
+try:
+    import uvloop
+
+    new_event_loop = uvloop.new_event_loop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    new_event_loop = asyncio.new_event_loop
+    UVLOOP_AVAILABLE = False
+
+# Fixed signaling payloads, encoded once and resent on every (re)registration
+REGISTER_MESSAGE = json_dumps({"type": "register-coordinator"})
+# Offer envelope; only the JSON-encoded ids and SDP are filled in per offer
+OFFER_TEMPLATE = (
+    '{{"type":"offer","sourceId":{source},"targetId":{target},'
+    '"offer":{{"sdp":{sdp},"type":"offer"}}}}'
+)
+
+
+# Adaptive frame skipping: every ADAPT_WINDOW offered frames a track compares
+# how many it overwrote before recv() took them, and doubles (up to
+# MAX_SKIP_STRIDE) or halves the stride of frames it skips before warping
+ADAPT_WINDOW = 30
+MAX_SKIP_STRIDE = 8
 
 
 class RTCVideoStreamTrack(VideoStreamTrack):
     """
     A video track that receives frames from an external source, performs a
-    perspective warp if specified, and queues them for sending.
+    perspective warp if specified, and holds the latest one for sending.
     """
 
     kind = "video"
 
     def __init__(self, warp_matrix=None, output_size=(640, 480)):
         super().__init__()
-        self.queue = asyncio.Queue(maxsize=1)
+        # Single latest-frame slot; a newer frame simply overwrites an unsent one.
+        # Producers write it from their own threads, so the warp runs off the
+        # event loop and the loop is only woken when the slot was empty
+        self._loop = asyncio.get_running_loop()
+        self._slot_lock = threading.Lock()
+        self._latest = None
+        self._frame_event = asyncio.Event()
+        # Backpressure: frames offered/overwritten in the current window and
+        # the current skip stride (1 = use every frame)
+        self._offered = 0
+        self._dropped = 0
+        self._skip_stride = 1
         self.warp_matrix = warp_matrix
         self.output_size = output_size if output_size is not None else (640, 480)
+        # VideoFrames are filled on the producer thread and recycled: the frame
+        # returned by recv() is in use by the encoder until the next recv(), and
+        # frames overwritten in the slot are free again at once
+        self._free_frames = []
+        self._sent_frame = None
+
+    def _acquire_video_frame(self, width, height):
+        """
+        Get a recycled bgr24 VideoFrame, allocating one only when none of the
+        right size is free.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+
+        Returns:
+            Tuple of (video_frame, pixels) where pixels is a writable
+            (height, width, 3) uint8 view of the frame's plane
+        """
+        video_frame = None
+        with self._slot_lock:
+            while self._free_frames:
+                candidate = self._free_frames.pop()
+                # Frames of a previous size are dropped
+                if candidate.width == width and candidate.height == height:
+                    video_frame = candidate
+                    break
+        if video_frame is None:
+            video_frame = av.VideoFrame(width, height, "bgr24")
+
+        # View the plane directly; rows may be padded past width * 3
+        plane = video_frame.planes[0]
+        rows = np.frombuffer(plane, dtype=np.uint8).reshape(height, plane.line_size)
+        pixels = rows[:, : width * 3].reshape(height, width, 3)
+        return video_frame, pixels
 
     async def recv(self):
-        """Receives the next frame from the queue and returns it as a VideoFrame."""
-        frame = await self.queue.get()
+        """Waits for the latest frame, already converted to a VideoFrame, and returns it."""
+        while True:
+            await self._frame_event.wait()
+            self._frame_event.clear()
+            with self._slot_lock:
+                video_frame = self._latest
+                self._latest = None
+                if video_frame is not None:
+                    # The encoder is done with the frame from the previous call
+                    if self._sent_frame is not None:
+                        self._free_frames.append(self._sent_frame)
+                    self._sent_frame = video_frame
+            # A wakeup scheduled for a frame already taken finds the slot empty
+            if video_frame is not None:
+                break
 
         try:
             pts, time_base = await self.next_timestamp()
-            video_frame = av.VideoFrame.from_ndarray(frame, format="bgr24")
             video_frame.pts = pts
             video_frame.time_base = time_base
             return video_frame
         except Exception as e:
-            logger.error(f"RTCVideoStreamTrack: Error creating VideoFrame: {e}")
+            logger.error(f"RTCVideoStreamTrack: Error timestamping VideoFrame: {e}")
             return None
 
+    def _adapt_skip_stride(self):
+        """Adjust the skip stride at the end of each window of offered frames."""
+        if self._offered < ADAPT_WINDOW:
+            return
+
+        sent = self._offered // self._skip_stride
+        if self._dropped * 2 > sent:
+            # More than half the warped frames were never sent; back off
+            self._skip_stride = min(self._skip_stride * 2, MAX_SKIP_STRIDE)
+        elif self._dropped == 0 and self._skip_stride > 1:
+            # Keeping up; recover frame rate
+            self._skip_stride //= 2
+        self._offered = 0
+        self._dropped = 0
+
     def add_frame(self, frame):
         """
-        Adds a frame to the queue, warping it first if a warp_matrix is set.
-        Discards an old frame if the queue is full.
+        Stores a frame as the latest one, warping it first if a warp_matrix is
+        set and converting it to a VideoFrame, so recv() on the event loop only
+        timestamps it. Any frame not yet picked up by recv() is replaced. Frames
+        must be contiguous (H, W, 3) uint8 arrays; the video sources check this.
+
+        Called directly from the producer thread.
         """
         try:
             if frame is None:
                 return
 
-            # Warp the frame if a matrix is defined
-            if self.warp_matrix is not None and self.output_size is not None:
-                warped_frame = cv2.warpPerspective(
-                    frame, self.warp_matrix, self.output_size
-                )
-                processed_frame = warped_frame
-            else:
-                # If no warp is specified, use the frame as is
-                processed_frame = frame
-
-            if not hasattr(processed_frame, "shape") or len(processed_frame.shape) != 3:
-                logger.warning("Invalid frame after processing, skipping.")
+            # When the sender falls behind, skip frames before paying for the
+            # warp rather than warping frames that would be overwritten
+            self._offered += 1
+            if self._offered % self._skip_stride:
+                self._adapt_skip_stride()
                 return
 
-            if self.queue.full():
-                self.queue.get_nowait()
-
-            self.queue.put_nowait(processed_frame)
+            # Warp the frame if a matrix is defined; read both once since the
+            # loop thread may update them while this thread is warping
+            warp_matrix = self.warp_matrix
+            output_size = self.output_size
+            if warp_matrix is not None and output_size is not None:
+                video_frame, pixels = self._acquire_video_frame(*output_size)
+                if pixels.flags["C_CONTIGUOUS"]:
+                    # Warp straight into the VideoFrame's plane
+                    cv2.warpPerspective(frame, warp_matrix, output_size, dst=pixels)
+                else:
+                    pixels[...] = cv2.warpPerspective(frame, warp_matrix, output_size)
+            else:
+                # If no warp is specified, send the frame as is
+                height, width = frame.shape[:2]
+                video_frame, pixels = self._acquire_video_frame(width, height)
+                pixels[...] = frame
+
+            with self._slot_lock:
+                previous = self._latest
+                self._latest = video_frame
+                if previous is not None:
+                    self._free_frames.append(previous)
+            if previous is None:
+                self._loop.call_soon_threadsafe(self._frame_event.set)
+            else:
+                self._dropped += 1
+            self._adapt_skip_stride()
         except Exception as e:
-            logger.error(f"RTCVideoStreamTrack: Error adding frame to queue: {e}")
+            logger.error(f"RTCVideoStreamTrack: Error adding frame: {e}")
 
 
 class Coordinator:
     """WebRTC Coordinator for establishing multiple peer connections."""
 
     def __init__(self):
-        self.status_queue = queue.Queue()
+        # Status updates for polling consumers; deque appends/pops are atomic,
+        # and the event wakes a blocked get_status(). The oldest updates are
+        # dropped if nobody polls
+        self.status_queue = deque(maxlen=1024)
+        self._status_event = threading.Event()
+        self.status_callback = None  # Called as func(status_type, message) when set
         self.loop = None
         self.webrtc_thread = None
         self.video_source = None
@@ -94,6 +229,20 @@ class Coordinator:
         self.subordinate_display_sizes = {}  # subordinate_id -> (width, height)
         self._video_source_type = "screen"  # "screen" or "file"
         self._video_file_path = None
+        self._shutting_down = False
+        self._shutdown_event = None  # asyncio.Event on the coordinator loop
+        self._pending_candidates = {}  # subordinate_id -> [RTCIceCandidate] awaiting a flush
+        self._ice_flush_tasks = {}  # subordinate_id -> task adding its pending candidates
+        # Signaling message type -> handler, for server messages and for messages
+        # relayed from a connected subordinate respectively
+        self._message_handlers = {
+            "registered": self._on_registered,
+            "subordinate-info": self._on_subordinate_info,
+        }
+        self._connection_handlers = {
+            "answer": self._on_answer,
+            "ice-candidate": self._on_ice_candidate,
+        }
 
     def start(self):
         """Start the coordinator's main event loop and websocket connection."""
@@ -107,39 +256,61 @@ class Coordinator:
 
     def _run_main_loop(self):
         """Runs the asyncio event loop."""
-        self.loop = asyncio.new_event_loop()
+        self.loop = new_event_loop()
         asyncio.set_event_loop(self.loop)
         try:
             self.loop.run_until_complete(self._connect_and_listen())
         except Exception as e:
             logger.error(f"Main loop encountered an error: {e}")
-            self.status_queue.put(("error", f"Main loop failed: {e}"))
+            self._put_status("error", f"Main loop failed: {e}")
         finally:
             self.loop.run_until_complete(self.shutdown())
             self.loop.close()
 
     async def _connect_and_listen(self):
-        """Connects to the signaling server and listens for messages."""
+        """
+        Connects to the signaling server and listens for messages, reconnecting
+        on the same event loop if the connection drops. Peer connections and the
+        video source live on this loop and survive a signaling reconnect.
+        """
         uri = "ws://localhost:3000"
-        try:
-            async with connect(uri) as websocket:
-                self.websocket = websocket
-                await self._register_with_server()
-                async for message in websocket:
-                    await self._handle_signaling_message(message)
-        except Exception as e:
-            logger.error(f"WebSocket connection failed: {e}")
-            self.status_queue.put(("error", f"WebSocket connection failed: {e}"))
+        retry_delay = 1.0
+        self._shutdown_event = asyncio.Event()
+        while not self._shutting_down:
+            try:
+                async with connect(uri) as websocket:
+                    self.websocket = websocket
+                    await self._register_with_server()
+                    retry_delay = 1.0
+                    async for message in websocket:
+                        await self._handle_signaling_message(message)
+            except Exception as e:
+                logger.error(f"WebSocket connection failed: {e}")
+                self._put_status("error", f"WebSocket connection failed: {e}")
+            finally:
+                self.websocket = None
+
+            if self._shutting_down:
+                break
+            self._put_status(
+                "info", f"Reconnecting to signaling server in {retry_delay:.0f}s..."
+            )
+            try:
+                # Sleep for the backoff, waking early if shutdown is requested
+                await asyncio.wait_for(self._shutdown_event.wait(), retry_delay)
+            except asyncio.TimeoutError:
+                pass
+            retry_delay = min(retry_delay * 2, 30.0)
 
     async def _register_with_server(self):
         """Registers as a coordinator with the signaling server."""
-        await self.websocket.send(json.dumps({"type": "register-coordinator"}))
+        await self.websocket.send(REGISTER_MESSAGE)
         message = await self.websocket.recv()
-        data = json.loads(message)
+        data = json_loads(message)
         if data.get("type") == "registered":
             self.coordinator_id = data["id"]
-            self.status_queue.put(
-                ("registered", f"Registered with ID: {self.coordinator_id}")
+            self._put_status(
+                "registered", f"Registered with ID: {self.coordinator_id}"
             )
             logger.info(
                 f"Registered with server. Coordinator ID: {self.coordinator_id}"
@@ -150,15 +321,15 @@ class Coordinator:
     def connect_by_id(self, subordinate_id, warp_matrix=None, output_size=None, screen_points=None, source_screen_size=None):
         """Connect to a subordinate using the given ID and optional warp parameters."""
         if not self.loop or not self.loop.is_running():
-            self.status_queue.put(
-                ("error", "Coordinator not started. Call start() first.")
+            self._put_status(
+                "error", "Coordinator not started. Call start() first."
             )
             logger.error("Cannot connect, event loop is not running.")
             return
 
         if subordinate_id in self.connections:
-            self.status_queue.put(
-                ("warning", f"Already connected or connecting to {subordinate_id}")
+            self._put_status(
+                "warning", f"Already connected or connecting to {subordinate_id}"
             )
             return
 
@@ -170,8 +341,8 @@ class Coordinator:
                 logger.info(f"Using stored display size for {subordinate_id}: {output_size}")
             else:
                 # Request display size from server before connecting
-                self.status_queue.put(
-                    ("info", f"Requesting display size for {subordinate_id}...")
+                self._put_status(
+                    "info", f"Requesting display size for {subordinate_id}..."
                 )
                 asyncio.run_coroutine_threadsafe(
                     self._request_subordinate_info_and_connect(subordinate_id, warp_matrix, screen_points, source_screen_size),
@@ -179,8 +350,8 @@ class Coordinator:
                 )
                 return
 
-        self.status_queue.put(
-            ("connecting", f"Connecting to subordinate {subordinate_id}...")
+        self._put_status(
+            "connecting", f"Connecting to subordinate {subordinate_id}..."
         )
         asyncio.run_coroutine_threadsafe(
             self._create_peer_connection(subordinate_id, warp_matrix, output_size, screen_points, source_screen_size),
@@ -236,14 +407,14 @@ class Coordinator:
                 f"ICE connection state for {subordinate_id} is {pc.iceConnectionState}"
             )
             if pc.iceConnectionState == "failed":
-                self.status_queue.put(
-                    ("failed", f"ICE connection failed for {subordinate_id}")
+                self._put_status(
+                    "failed", f"ICE connection failed for {subordinate_id}"
                 )
                 await self.cleanup_connection(subordinate_id)
             elif pc.iceConnectionState in ["connected", "completed"]:
                 self.connections[subordinate_id]["status"] = "connected"
-                self.status_queue.put(
-                    ("connected", f"Connected to subordinate {subordinate_id}")
+                self._put_status(
+                    "connected", f"Connected to subordinate {subordinate_id}"
                 )
                 self._start_video_source_if_needed()
                 if self.video_source:
@@ -251,8 +422,8 @@ class Coordinator:
                         self.connections[subordinate_id]["video_track"]
                     )
             elif pc.iceConnectionState == "disconnected":
-                self.status_queue.put(
-                    ("disconnected", f"Connection lost with {subordinate_id}")
+                self._put_status(
+                    "disconnected", f"Connection lost with {subordinate_id}"
                 )
                 await self.cleanup_connection(subordinate_id)
 
@@ -263,15 +434,15 @@ class Coordinator:
         def on_open():
             logger.info(f"Data channel for {subordinate_id} is open")
             channel.send(f"Hello from Python coordinator to {subordinate_id}!")
-            self.status_queue.put(
-                ("channel_open", f"Data channel for {subordinate_id} opened")
+            self._put_status(
+                "channel_open", f"Data channel for {subordinate_id} opened"
             )
 
         @channel.on("message")
         def on_message(message):
             logger.info(f"Received message from {subordinate_id}: {message}")
             try:
-                msg_obj = json.loads(message)
+                msg_obj = json_loads(message)
                 if isinstance(msg_obj, dict) and msg_obj.get("type") == "subordinate-info":
                     # This is a fallback - display size should already be received from server
                     # during initial connection, but handle it here just in case
@@ -284,26 +455,60 @@ class Coordinator:
                             self.subordinate_display_sizes[subordinate_id] = (width, height)
                             # Update the connection with the actual display size if needed
                             asyncio.ensure_future(self._update_connection_output_size(subordinate_id, (width, height)))
-                            self.status_queue.put(("subordinate-info", f"Received display size from {subordinate_id}: {width}x{height}"))
+                            self._put_status("subordinate-info", f"Received display size from {subordinate_id}: {width}x{height}")
                 else:
-                    self.status_queue.put(("message", f"Msg from {subordinate_id}: {message}"))
+                    self._put_status("message", f"Msg from {subordinate_id}: {message}")
             except Exception as e:
                 logger.warning(f"Failed to parse data channel message from {subordinate_id}: {e}")
-                self.status_queue.put(("message", f"Msg from {subordinate_id}: {message}"))
+                self._put_status("message", f"Msg from {subordinate_id}: {message}")
 
         # Create and send offer
         offer = await pc.createOffer()
         await pc.setLocalDescription(offer)
 
-        message = {
-            "type": "offer",
-            "sourceId": self.coordinator_id,
-            "targetId": subordinate_id,
-            "offer": {"sdp": pc.localDescription.sdp, "type": pc.localDescription.type},
-        }
+        message = OFFER_TEMPLATE.format(
+            source=json_dumps(self.coordinator_id),
+            target=json_dumps(subordinate_id),
+            sdp=json_dumps(pc.localDescription.sdp),
+        )
         logger.info(f"[Coordinator] Sending offer to {subordinate_id} with output_size={self.connections[subordinate_id]['output_size']}")
-        await self.websocket.send(json.dumps(message))
-        self.status_queue.put(("offer_sent", f"WebRTC offer sent to {subordinate_id}"))
+        if not await self._send_signaling(message, f"offer to {subordinate_id}"):
+            # Drop the half-set-up connection so the subordinate can be retried
+            await self.cleanup_connection(subordinate_id)
+            return
+        self._put_status("offer_sent", f"WebRTC offer sent to {subordinate_id}")
+
+    async def _send_signaling(self, message, description):
+        """
+        Send a message to the signaling server, if connected.
+
+        The websocket is None while reconnecting after a dropped connection,
+        and may close during the send.
+
+        Args:
+            message: JSON-encoded message
+            description: What is being sent, for the log and status message
+
+        Returns:
+            bool: True if the message was sent
+        """
+        websocket = self.websocket
+        if websocket is None:
+            error_msg = (
+                f"Cannot send {description}: not connected to the signaling "
+                "server (reconnecting)"
+            )
+            logger.warning(error_msg)
+            self._put_status("error", error_msg)
+            return False
+        try:
+            await websocket.send(message)
+            return True
+        except Exception as e:
+            error_msg = f"Cannot send {description}: {e}"
+            logger.error(error_msg)
+            self._put_status("error", error_msg)
+            return False
 
     def set_video_source_type(self, source_type, video_file_path=None):
         """
@@ -370,7 +575,10 @@ class Coordinator:
             "type": "get-subordinate-info",
             "subordinateId": subordinate_id,
         }
-        await self.websocket.send(json.dumps(request_message))
+        if not await self._send_signaling(
+            json_dumps(request_message), f"display size request for {subordinate_id}"
+        ):
+            return
         logger.info(f"Requested subordinate info for {subordinate_id}")
         
         # Wait for the response (it will be handled in _handle_signaling_message)
@@ -385,7 +593,7 @@ class Coordinator:
 
     async def _handle_signaling_message(self, message):
         """Handles incoming messages from the signaling server."""
-        data = json.loads(message)
+        data = json_loads(message)
         msg_type = data.get("type")
         source_id = data.get("sourceId")
 
@@ -393,148 +601,202 @@ class Coordinator:
             f"Received signaling message of type '{msg_type}' from '{source_id}'"
         )
 
-        if msg_type == "registered":
-            # If subordinate registration, store display size if present
-            if "width" in data and "height" in data and "id" in data:
-                logger.info(f"[Coordinator] Subordinate {data['id']} reported display size: width={data['width']}, height={data['height']}")
-                self.subordinate_display_sizes[data["id"]] = (data["width"], data["height"])
+        handler = self._message_handlers.get(msg_type)
+        if handler:
+            await handler(data)
             return
 
-        if msg_type == "subordinate-info":
-            # Response to get-subordinate-info request
-            subordinate_id = data.get("subordinateId")
-            if "error" in data:
-                logger.warning(f"Failed to get subordinate info for {subordinate_id}: {data['error']}")
-                self.status_queue.put(
-                    ("error", f"Failed to get display size for {subordinate_id}: {data['error']}")
+        connection = self.connections.get(source_id)
+        if not connection:
+            logger.warning(f"Received message for unknown subordinate: {source_id}")
+            return
+
+        handler = self._connection_handlers.get(msg_type)
+        if handler:
+            await handler(source_id, connection["pc"], data)
+
+    async def _on_registered(self, data):
+        """Handles a registration notice, which may carry a subordinate's display size."""
+        # If subordinate registration, store display size if present
+        if "width" in data and "height" in data and "id" in data:
+            logger.info(f"[Coordinator] Subordinate {data['id']} reported display size: width={data['width']}, height={data['height']}")
+            self.subordinate_display_sizes[data["id"]] = (data["width"], data["height"])
+
+    async def _on_subordinate_info(self, data):
+        """Handles the response to a get-subordinate-info request."""
+        subordinate_id = data.get("subordinateId")
+        if "error" in data:
+            logger.warning(f"Failed to get subordinate info for {subordinate_id}: {data['error']}")
+            self._put_status(
+                "error", f"Failed to get display size for {subordinate_id}: {data['error']}"
+            )
+            # Use default size if info not available
+            output_size = (640, 480)
+        else:
+            width = data.get("width")
+            height = data.get("height")
+            if width and height:
+                output_size = (width, height)
+                self.subordinate_display_sizes[subordinate_id] = output_size
+                logger.info(f"[Coordinator] Received subordinate info for {subordinate_id}: {width}x{height}")
+                self._put_status(
+                    "info", f"Received display size for {subordinate_id}: {width}x{height}"
                 )
-                # Use default size if info not available
-                output_size = (640, 480)
             else:
-                width = data.get("width")
-                height = data.get("height")
-                if width and height:
-                    output_size = (width, height)
-                    self.subordinate_display_sizes[subordinate_id] = output_size
-                    logger.info(f"[Coordinator] Received subordinate info for {subordinate_id}: {width}x{height}")
-                    self.status_queue.put(
-                        ("info", f"Received display size for {subordinate_id}: {width}x{height}")
-                    )
+                logger.warning(f"Invalid subordinate info response: {data}")
+                output_size = (640, 480)
+
+        # Check if there's a pending connection for this subordinate
+        if hasattr(self, "_pending_connections") and subordinate_id in self._pending_connections:
+            pending = self._pending_connections.pop(subordinate_id)
+
+            # Recalculate warp matrix with the correct output size
+            warp_matrix = pending.get("warp_matrix")
+            screen_points = pending.get("screen_points")
+            source_screen_size = pending.get("source_screen_size")
+
+            if screen_points is not None and source_screen_size is not None:
+                # Convert screen_points back to numpy array if it's a list
+                if isinstance(screen_points, list):
+                    screen_points_np = np.array(screen_points, dtype=np.float32)
                 else:
-                    logger.warning(f"Invalid subordinate info response: {data}")
-                    output_size = (640, 480)
-            
-            # Check if there's a pending connection for this subordinate
-            if hasattr(self, "_pending_connections") and subordinate_id in self._pending_connections:
-                pending = self._pending_connections.pop(subordinate_id)
-                
-                # Recalculate warp matrix with the correct output size
-                warp_matrix = pending.get("warp_matrix")
-                screen_points = pending.get("screen_points")
-                source_screen_size = pending.get("source_screen_size")
-                
-                if screen_points is not None and source_screen_size is not None:
-                    # Convert screen_points back to numpy array if it's a list
-                    if isinstance(screen_points, list):
-                        screen_points_np = np.array(screen_points, dtype=np.float32)
+                    screen_points_np = screen_points
+
+                # Ensure screen_points is in the right shape (4, 2)
+                if len(screen_points_np.shape) == 3:
+                    screen_points_np = np.squeeze(screen_points_np, axis=1)
+
+                if screen_points_np.shape[0] == 4:
+                    # Map the ENTIRE source screen to the subordinate display, maintaining aspect ratio
+                    src_width, src_height = source_screen_size
+                    src_aspect = src_width / src_height if src_height > 0 else 1.0
+
+                    dst_width, dst_height = output_size
+                    dst_aspect = dst_width / dst_height if dst_height > 0 else 1.0
+
+                    # Calculate how to fit the source screen within the destination while maintaining aspect ratio
+                    if src_aspect > dst_aspect:
+                        # Source is wider - fit to width, add letterboxing
+                        fit_width = dst_width
+                        fit_height = int(dst_width / src_aspect)
+                        offset_x = 0
+                        offset_y = (dst_height - fit_height) // 2
                     else:
-                        screen_points_np = screen_points
-                    
-                    # Ensure screen_points is in the right shape (4, 2)
-                    if len(screen_points_np.shape) == 3:
-                        screen_points_np = np.squeeze(screen_points_np, axis=1)
-                    
-                    if screen_points_np.shape[0] == 4:
-                        # Map the ENTIRE source screen to the subordinate display, maintaining aspect ratio
-                        src_width, src_height = source_screen_size
-                        src_aspect = src_width / src_height if src_height > 0 else 1.0
-                        
-                        dst_width, dst_height = output_size
-                        dst_aspect = dst_width / dst_height if dst_height > 0 else 1.0
-                        
-                        # Calculate how to fit the source screen within the destination while maintaining aspect ratio
-                        if src_aspect > dst_aspect:
-                            # Source is wider - fit to width, add letterboxing
-                            fit_width = dst_width
-                            fit_height = int(dst_width / src_aspect)
-                            offset_x = 0
-                            offset_y = (dst_height - fit_height) // 2
-                        else:
-                            # Source is taller - fit to height, add pillarboxing
-                            fit_width = int(dst_height * src_aspect)
-                            fit_height = dst_height
-                            offset_x = (dst_width - fit_width) // 2
-                            offset_y = 0
-                        
-                        # Create source rectangle (full screen corners)
-                        src_rect = np.float32([
-                            [0, 0],
-                            [src_width, 0],
-                            [src_width, src_height],
-                            [0, src_height]
-                        ])
-                        
-                        # Create destination rectangle that maintains aspect ratio
-                        dst_rect = np.float32([
-                            [offset_x, offset_y],
-                            [offset_x + fit_width, offset_y],
-                            [offset_x + fit_width, offset_y + fit_height],
-                            [offset_x, offset_y + fit_height]
-                        ])
-                        
-                        # Calculate homography from QR code corners to screen corners
-                        # First, find the transformation from QR code corners to screen corners
-                        qr_to_screen = cv2.getPerspectiveTransform(screen_points_np, src_rect)
-                        
-                        # Then, find transformation from screen corners to destination
-                        screen_to_dst = cv2.getPerspectiveTransform(src_rect, dst_rect)
-                        
-                        # Combine transformations: QR -> Screen -> Destination
-                        warp_matrix = screen_to_dst @ qr_to_screen
-                        
-                        logger.info(f"Recalculated warp matrix for {subordinate_id}: source screen {src_width}x{src_height} -> destination {fit_width}x{fit_height} (full display {dst_width}x{dst_height})")
-                
-                self.status_queue.put(
-                    ("connecting", f"Connecting to subordinate {subordinate_id}...")
+                        # Source is taller - fit to height, add pillarboxing
+                        fit_width = int(dst_height * src_aspect)
+                        fit_height = dst_height
+                        offset_x = (dst_width - fit_width) // 2
+                        offset_y = 0
+
+                    # Create source rectangle (full screen corners)
+                    src_rect = np.float32([
+                        [0, 0],
+                        [src_width, 0],
+                        [src_width, src_height],
+                        [0, src_height]
+                    ])
+
+                    # Create destination rectangle that maintains aspect ratio
+                    dst_rect = np.float32([
+                        [offset_x, offset_y],
+                        [offset_x + fit_width, offset_y],
+                        [offset_x + fit_width, offset_y + fit_height],
+                        [offset_x, offset_y + fit_height]
+                    ])
+
+                    # Calculate homography from QR code corners to screen corners
+                    # First, find the transformation from QR code corners to screen corners
+                    qr_to_screen = cv2.getPerspectiveTransform(screen_points_np, src_rect)
+
+                    # Then, find transformation from screen corners to destination
+                    screen_to_dst = cv2.getPerspectiveTransform(src_rect, dst_rect)
+
+                    # Combine transformations: QR -> Screen -> Destination
+                    warp_matrix = screen_to_dst @ qr_to_screen
+
+                    logger.info(f"Recalculated warp matrix for {subordinate_id}: source screen {src_width}x{src_height} -> destination {fit_width}x{fit_height} (full display {dst_width}x{dst_height})")
+
+            self._put_status(
+                "connecting", f"Connecting to subordinate {subordinate_id}..."
+            )
+            await self._create_peer_connection(
+                subordinate_id,
+                warp_matrix,
+                output_size,
+                screen_points,
+                source_screen_size
+            )
+
+    async def _on_answer(self, source_id, pc, data):
+        """Applies a subordinate's WebRTC answer."""
+        answer = RTCSessionDescription(
+            sdp=data["answer"]["sdp"], type=data["answer"]["type"]
+        )
+        await pc.setRemoteDescription(answer)
+        self._put_status(
+            "answer_received", f"WebRTC answer from {source_id}"
+        )
+
+    async def _on_ice_candidate(self, source_id, pc, data):
+        """Queues a trickled ICE candidate from a subordinate."""
+        candidate_info = data.get("candidate")
+        if candidate_info and candidate_info.get("candidate"):
+            try:
+                candidate = RTCIceCandidate(
+                    candidate_info.get("candidate"),
+                    sdpMid=candidate_info.get("sdpMid"),
+                    sdpMLineIndex=candidate_info.get("sdpMLineIndex"),
                 )
-                await self._create_peer_connection(
-                    subordinate_id,
-                    warp_matrix,
-                    output_size,
-                    screen_points,
-                    source_screen_size
+            except Exception as e:
+                logger.error(f"Error adding ICE candidate from {source_id}: {e}")
+                return
+
+            # Candidates trickle in bursts; collect the burst and add it in
+            # one flush instead of awaiting each one between messages
+            self._pending_candidates.setdefault(source_id, []).append(candidate)
+            if source_id not in self._ice_flush_tasks:
+                task = asyncio.get_running_loop().create_task(
+                    self._flush_ice_candidates(source_id, pc)
                 )
-            return
+                # Keep a reference; the loop only holds the task weakly
+                self._ice_flush_tasks[source_id] = task
+                task.add_done_callback(self._log_ice_flush_result)
+        else:
+            logger.warning(f"Received empty ICE candidate from {source_id}")
 
-        connection = self.connections.get(source_id)
-        if not connection:
-            logger.warning(f"Received message for unknown subordinate: {source_id}")
-            return
+    async def _flush_ice_candidates(self, subordinate_id, pc):
+        """
+        Add the ICE candidates received from a subordinate during one burst of
+        signaling messages, one after another. Candidates arriving while the
+        flush runs are added by the same task.
 
-        pc = connection["pc"]
+        Args:
+            subordinate_id: ID of the subordinate that sent the candidates
+            pc: RTCPeerConnection to add them to
+        """
+        try:
+            # Yield once so the rest of an already-received burst is collected
+            await asyncio.sleep(0)
+            while True:
+                candidates = self._pending_candidates.pop(subordinate_id, None)
+                if not candidates:
+                    return
+                for candidate in candidates:
+                    try:
+                        await pc.addIceCandidate(candidate)
+                    except Exception as e:
+                        logger.error(f"Error adding ICE candidate from {subordinate_id}: {e}")
+        finally:
+            # Unregister before yielding again, so a candidate arriving after
+            # this point starts a new flush; cleanup may already have replaced it
+            if self._ice_flush_tasks.get(subordinate_id) is asyncio.current_task():
+                del self._ice_flush_tasks[subordinate_id]
 
-        if msg_type == "answer":
-            answer = RTCSessionDescription(
-                sdp=data["answer"]["sdp"], type=data["answer"]["type"]
-            )
-            await pc.setRemoteDescription(answer)
-            self.status_queue.put(
-                ("answer_received", f"WebRTC answer from {source_id}")
-            )
-        elif msg_type == "ice-candidate":
-            candidate_info = data.get("candidate")
-            if candidate_info and candidate_info.get("candidate"):
-                try:
-                    candidate = RTCIceCandidate(
-                        candidate_info.get("candidate"),
-                        sdpMid=candidate_info.get("sdpMid"),
-                        sdpMLineIndex=candidate_info.get("sdpMLineIndex"),
-                    )
-                    await pc.addIceCandidate(candidate)
-                except Exception as e:
-                    logger.error(f"Error adding ICE candidate from {source_id}: {e}")
-            else:
-                logger.warning(f"Received empty ICE candidate from {source_id}")
+    @staticmethod
+    def _log_ice_flush_result(task):
+        """Log an unexpected failure of an ICE candidate flush task."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"ICE candidate flush failed: {task.exception()}")
 
     async def _update_connection_output_size(self, subordinate_id, new_output_size):
         """Update the connection's output size and recalculate warp matrix if screen_points are available."""
@@ -584,13 +846,17 @@ class Coordinator:
             video_track.warp_matrix = new_warp_matrix
             video_track.output_size = new_output_size
             logger.info(f"Updated connection for {subordinate_id} with output_size={new_output_size}")
-            self.status_queue.put(("warp_updated", f"Updated warp matrix for {subordinate_id} with display size {width}x{height}"))
+            self._put_status("warp_updated", f"Updated warp matrix for {subordinate_id} with display size {width}x{height}")
         else:
             logger.warning(f"No video track found for {subordinate_id}")
 
     async def cleanup_connection(self, subordinate_id):
         """Cleans up a connection for a given subordinate."""
         connection = self.connections.pop(subordinate_id, None)
+        self._pending_candidates.pop(subordinate_id, None)
+        flush_task = self._ice_flush_tasks.pop(subordinate_id, None)
+        if flush_task:
+            flush_task.cancel()
         if connection:
             logger.info(f"Cleaning up connection for {subordinate_id}")
             if self.video_source and connection.get("video_track"):
@@ -609,6 +875,9 @@ class Coordinator:
     async def shutdown(self):
         """Shuts down all connections and the video source."""
         logger.info("Shutting down coordinator...")
+        self._shutting_down = True
+        if self._shutdown_event:
+            self._shutdown_event.set()
         subordinate_ids = list(self.connections.keys())
         for sub_id in subordinate_ids:
             await self.cleanup_connection(sub_id)
@@ -622,14 +891,58 @@ class Coordinator:
 
         logger.info("Shutdown complete.")
 
-    def get_status(self):
-        """Get the latest status update if available."""
+    def set_status_callback(self, callback):
+        """
+        Push status updates to a callback instead of the polled status queue.
+        Any updates queued before the callback was set are delivered first.
+        """
+        self.status_callback = callback
+        if callback:
+            while True:
+                status = self.get_status()
+                if status is None:
+                    break
+                callback(*status)
+
+    def _put_status(self, status_type, message):
+        """Publish a status update to the callback if set, else to the queue."""
+        if self.status_callback:
+            self.status_callback(status_type, message)
+        else:
+            self.status_queue.append((status_type, message))
+            self._status_event.set()
+
+    def get_status(self, timeout=None):
+        """
+        Get the latest status update if available.
+
+        Args:
+            timeout: Seconds to block waiting for an update (None = don't block)
+        """
+        try:
+            return self.status_queue.popleft()
+        except IndexError:
+            if timeout is None:
+                return None
+
+        # Clear before checking again, so an update appended after the check
+        # still sets the event and ends the wait
+        self._status_event.clear()
         try:
-            return self.status_queue.get_nowait()
-        except queue.Empty:
+            return self.status_queue.popleft()
+        except IndexError:
+            pass
+        self._status_event.wait(timeout)
+        try:
+            return self.status_queue.popleft()
+        except IndexError:
             return None
 
 
+# Seconds the CLI waits for a status update before checking for Ctrl-C again
+STATUS_WAIT_TIMEOUT = 0.5
+
+
 def main():
     parser = argparse.ArgumentParser(description="Python WebRTC coordinator")
     parser.add_argument(
@@ -644,12 +957,11 @@ def main():
     print("Waiting for coordinator to register with the server...")
     registered = False
     while not registered:
-        status = coordinator.get_status()
+        status = coordinator.get_status(timeout=STATUS_WAIT_TIMEOUT)
         if status:
             print(f"Status: {status[0]} - {status[1]}")
             if status[0] == "registered":
                 registered = True
-        time.sleep(0.1)
 
     # Connect to all specified subordinates
     for sub_id in args.ids:
@@ -658,10 +970,12 @@ def main():
     # Keep the program running to monitor status
     try:
         while True:
-            status = coordinator.get_status()
+            # Sleep until an update is published; the bounded wait lets
+            # Ctrl-C through on every platform (an untimed wait on Windows
+            # cannot be interrupted)
+            status = coordinator.get_status(timeout=STATUS_WAIT_TIMEOUT)
             if status:
                 print(f"Status: {status[0]} - {status[1]}")
-            time.sleep(0.1)
     except KeyboardInterrupt:
         print("\nShutting down...")
         if coordinator.loop and coordinator.loop.is_running():
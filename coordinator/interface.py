@@ -6,6 +6,7 @@ Main application window for the Phosaic coordinator GUI.
 import asyncio
 import json
 import sys
+import time
 import cv2
 import numpy as np
 from PyQt6.QtWidgets import (
@@ -22,10 +23,16 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtGui import QTextCursor
 from qt_material import apply_stylesheet
 
-# Add project root to path to allow sibling imports
-sys.path.append(sys.path[0] + "/..")
+# Prefer orjson for parsing QR payloads; its JSONDecodeError subclasses the stdlib one.
+# OpenCV decodes QR payloads to str and orjson parses str directly, so payloads
+# are passed through as-is rather than being encoded to bytes first.
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 from components.camera_interface import CameraInterface
 from components.managers import (
@@ -53,6 +60,10 @@ class MainWindow(QMainWindow):
         self.video_file_manager = VideoFileManager()
         self.connection_manager = ConnectionManager(self.coordinator)
         self.connected_ids = set()  # Track connected subordinate IDs
+        self._recent_qr = {}  # QR payload -> monotonic time it was last processed
+        self._recent_qr_pruned = time.monotonic()
+        self._status_buffer = []  # Messages waiting for the next status flush
+        self._status_flush_pending = False
 
         self.init_ui()
         self.connect_signals()
@@ -82,6 +93,8 @@ class MainWindow(QMainWindow):
         self.status_text = QTextEdit()
         self.status_text.setMaximumHeight(150)
         self.status_text.setReadOnly(True)
+        # Evict the oldest lines so long sessions don't slow down appends
+        self.status_text.document().setMaximumBlockCount(500)
         self.append_status_message("Ready to scan QR codes for peer connections...")
         main_layout.addWidget(self.status_text)
 
@@ -197,12 +210,29 @@ class MainWindow(QMainWindow):
         if not qr_codes:
             return
 
+        now = time.monotonic()
+        if now - self._recent_qr_pruned > 10.0:
+            self._recent_qr = {
+                k: t for k, t in self._recent_qr.items() if now - t <= 10.0
+            }
+            self._recent_qr_pruned = now
+
         for data, points in qr_codes:
             if not data:
                 continue
 
+            # A code held up to the camera is seen every frame; handle it at most every 2 s
+            if self._recent_qr.get(data, 0) > now - 2.0:
+                continue
+            self._recent_qr[data] = now
+
+            # Every payload we generate is a JSON object; skip the parser otherwise
+            if data[0] != "{":
+                self.append_status_message(f"Warning: Invalid JSON in QR code: {data}")
+                continue
+
             try:
-                qr_json = json.loads(data)
+                qr_json = json_loads(data)
                 subordinate_id = qr_json.get("id")
                 if not subordinate_id:
                     self.append_status_message(
@@ -234,8 +264,7 @@ class MainWindow(QMainWindow):
                         )
                         continue
 
-                camera_height, camera_width, _ = frame.shape
-                camera_size = (camera_width, camera_height)
+                camera_size = (frame.width(), frame.height())
 
                 mapper = ProjectionMapper(screen_size, camera_size)
                 screen_points = mapper.map_points(points)
@@ -432,15 +461,35 @@ class MainWindow(QMainWindow):
             self.toggle_screen_capture()
 
     def append_status_message(self, message):
-        """Append a message to the status text box."""
-        self.status_text.append(str(message))
-        scrollbar = self.status_text.verticalScrollBar()
-        # PyQt6: Use .setValue and .maximum() as before
-        scrollbar.setValue(scrollbar.maximum())
+        """Queue a message for the status text box; bursts are flushed together."""
+        self._status_buffer.append(str(message))
+        if not self._status_flush_pending:
+            self._status_flush_pending = True
+            QTimer.singleShot(
+                50, Qt.TimerType.CoarseTimer, self._flush_status_messages
+            )
+
+    def _flush_status_messages(self):
+        """Append all queued messages in one call so the text box lays out once."""
+        self._status_flush_pending = False
+        if not self._status_buffer:
+            return
+        # Insert as plain text; QTextEdit.append would render a batch that
+        # looks like HTML (e.g. a QR payload containing '<') as rich text
+        cursor = self.status_text.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.status_text.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertText("\n".join(self._status_buffer))
+        self._status_buffer.clear()
+        # Moving the cursor to the end also scrolls it into view
+        self.status_text.setTextCursor(cursor)
 
     def closeEvent(self, event):
         """Handle application close event."""
         self.camera_manager.stop_camera()
+        if self.camera_manager.enumerator_thread:
+            self.camera_manager.enumerator_thread.wait()
         self.screen_capture_manager.stop_screen_capture()
         self.video_file_manager.stop_video_file()
 
@@ -70,7 +70,6 @@ class ProjectionMapper:
         transformed_points = cv2.perspectiveTransform(
             np.float32(points), self.homography_matrix
         )
-        transformed_points = cv2.perspectiveTransform(np.float32(points), self.homography_matrix)
         return transformed_points
 
     @staticmethod
@@ -9,16 +9,7 @@ import numpy as np
 logger = logging.getLogger(__name__)
 
 # Import the centralized screen capture service
-# Use relative import if in same package, or absolute if needed
-try:
-    from components.screen_capture_service import ScreenCaptureService
-except ImportError:
-    # Fallback for different import paths
-    import os
-    import sys
-
-    sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-    from components.screen_capture_service import ScreenCaptureService
+from components.screen_capture_service import ScreenCaptureService
 
 
 class VideoSource(threading.Thread):
@@ -30,6 +21,58 @@ class VideoSource(threading.Thread):
         self.loop = loop
         self.running = False
         self.daemon = True
+        self.tracks = []
+        self.lock = threading.Lock()
+        self._validated_shape = None  # Frame shape last checked by _is_valid_frame
+
+    def _is_valid_frame(self, frame):
+        """
+        Check that a frame is a contiguous (H, W, 3) uint8 array, as the video
+        tracks expect. A source's frames keep one format, so the full check
+        only runs when the frame shape changes.
+
+        Args:
+            frame: Frame to check
+
+        Returns:
+            bool: True if the frame can be sent to the tracks
+        """
+        if not isinstance(frame, np.ndarray):
+            logger.warning("Frame is not a numpy array, skipping")
+            return False
+        if frame.shape == self._validated_shape:
+            return True
+
+        if len(frame.shape) != 3 or frame.shape[2] != 3:
+            logger.warning(
+                f"Invalid frame shape: {frame.shape}, expected (H, W, 3), skipping"
+            )
+            return False
+        if frame.dtype != np.uint8:
+            logger.warning(
+                f"Invalid frame dtype: {frame.dtype}, expected uint8, skipping"
+            )
+            return False
+        if not frame.flags["C_CONTIGUOUS"]:
+            logger.warning("Frame is not C-contiguous, skipping")
+            return False
+
+        self._validated_shape = frame.shape
+        return True
+
+    def add_track(self, track):
+        """Adds a video track to the list of tracks to receive frames."""
+        with self.lock:
+            if track not in self.tracks:
+                self.tracks.append(track)
+                logger.info(f"Track added. Total tracks: {len(self.tracks)}")
+
+    def remove_track(self, track):
+        """Removes a video track from the list."""
+        with self.lock:
+            if track in self.tracks:
+                self.tracks.remove(track)
+                logger.info(f"Track removed. Total tracks: {len(self.tracks)}")
 
     def run(self):
         """Main loop for the video source."""
@@ -50,22 +93,6 @@ class ScreenCaptureSource(VideoSource):
         super().__init__(None, loop)  # No specific track upfront
         self.fps = fps
         self.service = ScreenCaptureService()
-        self.tracks = []
-        self.lock = threading.Lock()
-
-    def add_track(self, track):
-        """Adds a video track to the list of tracks to receive frames."""
-        with self.lock:
-            if track not in self.tracks:
-                self.tracks.append(track)
-                logger.info(f"Track added. Total tracks: {len(self.tracks)}")
-
-    def remove_track(self, track):
-        """Removes a video track from the list."""
-        with self.lock:
-            if track in self.tracks:
-                self.tracks.remove(track)
-                logger.info(f"Track removed. Total tracks: {len(self.tracks)}")
 
     def run(self):
         """Consumes frames from the centralized service and sends them to the video tracks."""
@@ -88,53 +115,37 @@ class ScreenCaptureSource(VideoSource):
             )
 
         frame_time = 1.0 / self.fps
+        next_deadline = time.monotonic()
 
         while self.running:
             try:
                 # Get the latest frame from the centralized service
                 frame = self.service.get_latest_frame()
 
-                if frame is not None and frame.size > 0:
-                    # Validate frame format before sending to video track
-                    if not isinstance(frame, np.ndarray):
-                        logger.warning("Frame is not a numpy array, skipping")
-                        time.sleep(frame_time)
-                        continue
-
-                    if len(frame.shape) != 3 or frame.shape[2] != 3:
-                        logger.warning(
-                            f"Invalid frame shape: {frame.shape}, expected (H, W, 3), skipping"
-                        )
-                        time.sleep(frame_time)
-                        continue
-
-                    if frame.dtype != np.uint8:
-                        logger.warning(
-                            f"Invalid frame dtype: {frame.dtype}, expected uint8, skipping"
-                        )
-                        time.sleep(frame_time)
-                        continue
-
-                    logger.debug(
-                        f"ScreenCaptureSource: Frame received from service. "
-                        f"Shape: {frame.shape}, dtype: {frame.dtype}"
-                    )
-
-                    # Ensure frame is contiguous before sending
-                    if not frame.flags["C_CONTIGUOUS"]:
-                        frame = np.ascontiguousarray(frame)
-
+                # The service publishes contiguous BGR uint8 frames, so the
+                # format check only runs when the frame size changes
+                if frame is not None and frame.size > 0 and self._is_valid_frame(frame):
+                    # Snapshot the tracks so add_track/remove_track on the event
+                    # loop never wait behind this frame's warps
                     with self.lock:
-                        for track in self.tracks:
-                            if self.loop and self.loop.is_running():
-                                self.loop.call_soon_threadsafe(track.add_frame, frame)
-                            else:
-                                logger.warning(
-                                    "Loop not available, skipping frame for a track"
-                                )
+                        tracks = list(self.tracks)
+                    for track in tracks:
+                        if self.loop and self.loop.is_running():
+                            track.add_frame(frame)
+                        else:
+                            logger.warning(
+                                "Loop not available, skipping frame for a track"
+                            )
 
-                # Maintain FPS
-                time.sleep(frame_time)
+                # Maintain FPS against an absolute deadline so the time spent
+                # on the frame is not added to the period
+                next_deadline += frame_time
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind; restart the schedule instead of bursting
+                    next_deadline = time.monotonic()
 
             except Exception as e:
                 logger.error(f"Error in screen capture loop: {e}")
@@ -164,27 +175,11 @@ class VideoFileSource(VideoSource):
         self.video_file_path = video_file_path
         self.fps = fps
         self.loop_video = loop_video
-        self.tracks = []
-        self.lock = threading.Lock()
         self.cap = None
         self.video_fps = None
         self.frame_width = None
         self.frame_height = None
 
-    def add_track(self, track):
-        """Adds a video track to the list of tracks to receive frames."""
-        with self.lock:
-            if track not in self.tracks:
-                self.tracks.append(track)
-                logger.info(f"Track added. Total tracks: {len(self.tracks)}")
-
-    def remove_track(self, track):
-        """Removes a video track from the list."""
-        with self.lock:
-            if track in self.tracks:
-                self.tracks.remove(track)
-                logger.info(f"Track removed. Total tracks: {len(self.tracks)}")
-
     def run(self):
         """Reads frames from the video file and sends them to the video tracks."""
         self.running = True
@@ -214,6 +209,7 @@ class VideoFileSource(VideoSource):
             )
 
             frame_time = 1.0 / self.fps
+            next_deadline = time.monotonic()
 
             while self.running:
                 ret, frame = self.cap.read()
@@ -233,47 +229,33 @@ class VideoFileSource(VideoSource):
                     time.sleep(frame_time)
                     continue
 
-                # Validate frame format
-                if not isinstance(frame, np.ndarray):
-                    logger.warning("Frame is not a numpy array, skipping")
-                    time.sleep(frame_time)
-                    continue
-
-                if len(frame.shape) != 3 or frame.shape[2] != 3:
-                    logger.warning(
-                        f"Invalid frame shape: {frame.shape}, expected (H, W, 3), skipping"
-                    )
-                    time.sleep(frame_time)
-                    continue
-
-                if frame.dtype != np.uint8:
-                    logger.warning(
-                        f"Invalid frame dtype: {frame.dtype}, expected uint8, skipping"
-                    )
+                # Validate frame format (only re-checked when the size changes)
+                if not self._is_valid_frame(frame):
                     time.sleep(frame_time)
                     continue
 
-                # Ensure frame is contiguous before sending
-                if not frame.flags["C_CONTIGUOUS"]:
-                    frame = np.ascontiguousarray(frame)
-
-                logger.debug(
-                    f"VideoFileSource: Frame read from file. "
-                    f"Shape: {frame.shape}, dtype: {frame.dtype}"
-                )
-
                 # Send frame to all tracks
+                # Snapshot the tracks so add_track/remove_track on the event
+                # loop never wait behind this frame's warps
                 with self.lock:
-                    for track in self.tracks:
-                        if self.loop and self.loop.is_running():
-                            self.loop.call_soon_threadsafe(track.add_frame, frame)
-                        else:
-                            logger.warning(
-                                "Loop not available, skipping frame for a track"
-                            )
+                    tracks = list(self.tracks)
+                for track in tracks:
+                    if self.loop and self.loop.is_running():
+                        track.add_frame(frame)
+                    else:
+                        logger.warning(
+                            "Loop not available, skipping frame for a track"
+                        )
 
-                # Maintain FPS
-                time.sleep(frame_time)
+                # Maintain FPS against an absolute deadline so the time spent
+                # on the frame is not added to the period
+                next_deadline += frame_time
+                delay = next_deadline - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    # Fell behind; restart the schedule instead of bursting
+                    next_deadline = time.monotonic()
 
         except Exception as e:
             logger.error(f"Error in video file playback loop: {e}")